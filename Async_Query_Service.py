@@ -0,0 +1,214 @@
+"""Author - Anantvir Singh, asyncio front-end for the single source shortest path algorithms"""
+
+# A plain Dijkstra() call blocks the event loop for its whole duration. Shortest_Path_Service moves every search onto a worker pool so the
+# event loop stays free, and adds 3 things on top :
+#   1) Coalescing --> concurrent queries with the same source share ONE single-source run, since one run answers every target at once
+#   2) Backpressure --> new sources wait in a bounded asyncio.Queue, so query() blocks (awaits) instead of piling up work when the pool is busy
+#   3) Latency histograms --> end-to-end query latency and pure search latency are counted into fixed buckets
+# Local_Shortest_Path_Client has the same await query(s,t) interface but runs the search inline, so tests do not need a pool or a service
+#
+# The executor must run in this process (the default ThreadPoolExecutor, or any thread based executor). A ProcessPoolExecutor would pickle
+# the whole graph for every single run and send back copies of the vertices, so dist.get(t) would never find the caller's t. It is rejected.
+
+import asyncio
+import bisect
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from Dijkstras_Algorithm import Graph, Single_Source_Distances
+
+class Latency_Histogram:
+    """Counts latencies (in milliseconds) into buckets. counts[i] = number of samples <= bounds[i], last bucket = everything above bounds[-1]"""
+    def __init__(self,bounds = (1,2,5,10,20,50,100,200,500,1000,2000,5000)):
+        self.bounds = list(bounds)
+        self.counts = [0 for x in range(len(self.bounds) + 1)]
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self,ms):
+        self.counts[bisect.bisect_left(self.bounds,ms)] += 1
+        self.total += 1
+        self.sum += ms
+
+    def mean(self):
+        return self.sum/self.total if self.total else 0.0
+
+    def snapshot(self):             # returns [(upper bound, count)], upper bound of the last bucket is infinity
+        return list(zip(self.bounds + [math.inf],self.counts))
+
+
+class _Run:
+    """One single-source run shared by every query for the same source"""
+    def __init__(self,fut):
+        self.fut = fut
+        self.waiters = 0            # queries currently awaiting fut
+        self.enqueue = None         # task putting the run into the queue, done once the run is queued
+
+
+class Shortest_Path_Service:
+
+    def __init__(self,G,executor = None,num_workers = 4,max_pending = 1024):
+        if isinstance(executor,ProcessPoolExecutor):
+            raise TypeError('Shortest_Path_Service needs a thread based executor, a process pool would pickle the graph on every run')
+        self._graph = G
+        self._executor = executor if executor is not None else ThreadPoolExecutor(max_workers = num_workers)
+        self._own_executor = executor is None           # only shut down a pool that was created here
+        self._num_workers = num_workers
+        self._queue = asyncio.Queue(maxsize = max_pending)     # runs waiting for a worker, new runs wait for space when it is full
+        self._inflight = {}                                     # source vertex --> _Run (waiting for space, queued or running)
+        self._workers = []
+        self._closed = False
+        self.latency = Latency_Histogram()                      # end-to-end latency of query() including queueing and coalescing
+        self.search_latency = Latency_Histogram()               # time spent inside Single_Source_Distances only
+        self.coalesced = 0                                      # number of queries that joined a run started by another query
+
+    async def start(self):
+        for i in range(self._num_workers):
+            self._workers.append(asyncio.create_task(self._worker()))
+        return self
+
+    async def close(self):
+        """Stops the workers and fails every query that has not been answered yet with RuntimeError"""
+        self._closed = True
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers,return_exceptions = True)     # a cancelled worker fails the run it was holding
+        self._workers = []
+        for run in list(self._inflight.values()):                          # runs still waiting for space in the queue
+            if run.enqueue is not None:
+                run.enqueue.cancel()
+        while not self._queue.empty():                                      # runs queued but never picked up
+            s,run = self._queue.get_nowait()
+            self._fail(run,s)
+        for s,run in list(self._inflight.items()):
+            self._fail(run,s)
+        if self._own_executor:
+            await asyncio.get_running_loop().run_in_executor(None,self._executor.shutdown)    # waits for running searches without blocking the loop
+
+    def _fail(self,run,s):
+        if not run.fut.done():
+            run.fut.set_exception(RuntimeError('Shortest_Path_Service is closed'))
+        if self._inflight.get(s) is run:
+            del self._inflight[s]
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self,exc_type,exc,tb):
+        await self.close()
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            s,run = await self._queue.get()
+            if run.fut.done():                          # every query for this run was cancelled while it was queued
+                self._queue.task_done()
+                continue
+            start = time.perf_counter()
+            try:
+                dist = await loop.run_in_executor(self._executor,Single_Source_Distances,self._graph,s)
+            except Exception as exc:
+                if not run.fut.done():
+                    run.fut.set_exception(exc)
+            else:
+                if not run.fut.done():
+                    run.fut.set_result(dist)
+            finally:                                    # also runs when close() cancels this worker in the middle of the search
+                self.search_latency.observe((time.perf_counter() - start)*1000)
+                if not run.fut.done():
+                    run.fut.set_exception(RuntimeError('Shortest_Path_Service is closed'))
+                if self._inflight.get(s) is run:        # later queries for s start a fresh run
+                    del self._inflight[s]
+                self._queue.task_done()
+
+    async def _distances_from(self,s):
+        if self._closed:
+            raise RuntimeError('Shortest_Path_Service is closed')
+        run = self._inflight.get(s)
+        if run is not None:                             # same source already waiting for space, queued or running --> wait for that run
+            self.coalesced += 1
+        else:
+            run = _Run(asyncio.get_running_loop().create_future())
+            self._inflight[s] = run
+            run.enqueue = asyncio.create_task(self._queue.put((s,run)))    # a separate task, so cancelling this caller does not drop the run
+        run.waiters += 1
+        try:
+            if not run.enqueue.done():                  # backpressure --> wait until the run has a place in the queue (or close() fails it)
+                await asyncio.wait([run.enqueue,run.fut],return_when = asyncio.FIRST_COMPLETED)     # wait() never cancels what it waits on
+            return await asyncio.shield(run.fut)        # shield --> a cancelled caller does not cancel the run other callers are waiting on
+        finally:
+            run.waiters -= 1
+            if run.waiters == 0 and not run.fut.done():             # last interested caller left (cancelled) --> drop the run
+                run.enqueue.cancel()                                # no-op if already queued, the worker then skips the cancelled fut
+                run.fut.cancel()
+                if self._inflight.get(s) is run:
+                    del self._inflight[s]
+
+    async def query(self,s,t):                          # shortest distance from s to t, math.inf if t is not reachable
+        start = time.perf_counter()
+        try:
+            dist = await self._distances_from(s)
+            return dist.get(t,math.inf)
+        finally:
+            self.latency.observe((time.perf_counter() - start)*1000)
+
+    async def query_all(self,s):                        # {vertex : distance} for every vertex reachable from s
+        start = time.perf_counter()
+        try:
+            return dict(await self._distances_from(s))
+        finally:
+            self.latency.observe((time.perf_counter() - start)*1000)
+
+
+class Local_Shortest_Path_Client:
+    """Stand-in for Shortest_Path_Service in tests --> same query()/query_all() coroutines, but the search runs inline on the event loop"""
+    def __init__(self,G):
+        self._graph = G
+        self.latency = Latency_Histogram()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self,exc_type,exc,tb):
+        pass
+
+    async def query(self,s,t):
+        start = time.perf_counter()
+        dist = Single_Source_Distances(self._graph,s)
+        self.latency.observe((time.perf_counter() - start)*1000)
+        return dist.get(t,math.inf)
+
+    async def query_all(self,s):
+        start = time.perf_counter()
+        dist = Single_Source_Distances(self._graph,s)
+        self.latency.observe((time.perf_counter() - start)*1000)
+        return dist
+
+
+if __name__ == '__main__':
+    gr = Graph(directed=True)       # Same graph as in Dijkstras_Algorithm.py
+    s = gr.insert_vertex('s')
+    t = gr.insert_vertex('t')
+    x = gr.insert_vertex('x')
+    y = gr.insert_vertex('y')
+    z = gr.insert_vertex('z')
+
+    gr.insert_edge(s,t,10)
+    gr.insert_edge(s,y,5)
+    gr.insert_edge(t,x,1)
+    gr.insert_edge(t,y,2)
+    gr.insert_edge(x,z,4)
+    gr.insert_edge(y,t,3)
+    gr.insert_edge(y,x,9)
+    gr.insert_edge(y,z,2)
+    gr.insert_edge(z,x,6)
+    gr.insert_edge(z,s,7)
+
+    async def main():
+        async with Shortest_Path_Service(gr,num_workers = 2,max_pending = 16) as sp:
+            answers = await asyncio.gather(sp.query(s,x),sp.query(s,z),sp.query(y,x),sp.query(s,t))     # the 3 queries from s share one run
+        async with Local_Shortest_Path_Client(gr) as local:
+            expected = [await local.query(s,x),await local.query(s,z),await local.query(y,x),await local.query(s,t)]
+        return answers,expected,sp.coalesced
+
+    answers,expected,coalesced = asyncio.run(main())
@@ -114,6 +114,7 @@ def Bellman_Ford(G,s):
 def Relax(u,v,w_uv):
     if v._d > u._d + w_uv:
         v._d = u._d + w_uv 
+        v._parent = u                       # u is the predecessor of v on the shortest path found so far
 
 
 
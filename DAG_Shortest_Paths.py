@@ -6,6 +6,7 @@
 
 # ------------------------------------ Vertex -----------------------------------------------
 import math
+import numpy as np
 class Vertex:
     def __init__(self,x):
         self.info = x
@@ -212,14 +213,34 @@ def DFS_Visit(G,u):
     return LL                               # Return the list
 
 
+"""Same order as Topsort() (vertices sorted by decreasing finishing time of the DFS) but with an explicit stack instead of the recursive
+DFS_Visit(), so a long chain of vertices can not hit Python's recursion limit. Nothing global is used, so repeated calls are independent"""
+def Topological_Order(G):
+    vertex_map = G.get_vertex_dict()
+    visited = set()
+    finished = []                                   # vertices in increasing finishing time
+    for root in vertex_map:
+        if root in visited:
+            continue
+        visited.add(root)
+        work = [(root,iter(vertex_map[root]))]      # (vertex, iterator over its remaining neighbours)
+        while work:
+            u,neighbours = work[-1]
+            for v in neighbours:
+                if v not in visited:                # descend into v, continue with u's remaining neighbours later
+                    visited.add(v)
+                    work.append((v,iter(vertex_map[v])))
+                    break
+            else:                                   # u is completely explored
+                work.pop()
+                finished.append(u)
+    finished.reverse()                              # same as adding each finished vertex to the front of a linked list
+    return finished
+
+
 def DAG_Shortest_Path(G,s):
     adj_map = G.get_vertex_dict()
-    Topsort(G)
-    node = LL.head
-    vertices = []
-    while node is not None:
-        vertices.append(node.info)
-        node = node.link
+    vertices = Topological_Order(G)
     for v in vertices:
         v.dist = math.inf
         v.parent = None
@@ -233,6 +254,32 @@ def DAG_Shortest_Path(G,s):
 def Relax(u,v,w_uv):
     if v.dist > u.dist + w_uv:
         v.dist = u.dist + w_uv         
+        v.parent = u                    # u is the predecessor of v on the shortest path found so far
+
+
+"""Batched version --> Topsort is done only once and all K sources are relaxed together in the same sweep. Each vertex holds a row of K distances
+(one column per source) so Relax becomes a single vectorized min (or max for longest paths) over the whole row instead of K separate passes"""
+def Batched_DAG_Shortest_Paths(G,sources,longest = False):
+    adj_map = G.get_vertex_dict()
+    vertices = Topological_Order(G)
+    index = {v : i for i,v in enumerate(vertices)}      # row of D that belongs to each vertex
+    K = len(sources)
+    D = np.full((len(vertices),K), -math.inf if longest else math.inf)
+    D[[index[s] for s in sources],np.arange(K)] = 0     # D[index[v]][k] = distance of v from sources[k]
+    relax = np.maximum if longest else np.minimum
+    for u in vertices:
+        row = D[index[u]]
+        if not np.isfinite(row).any():                  # u is not reachable from any source, so nothing to relax
+            continue
+        for v in adj_map[u].keys():
+            w_uv = adj_map[u][v].info
+            relax(D[index[v]],row + w_uv,out = D[index[v]])     # Batched Relax(u,v,w_uv) for all K sources at once
+    return D,index
+
+
+"""Longest path in a DAG = critical path (e.g. in a schedule where edge weights are task durations). Unreachable vertices stay at -infinity"""
+def Batched_DAG_Longest_Paths(G,sources):
+    return Batched_DAG_Shortest_Paths(G,sources,longest = True)
 
 
 g = Graph(directed = True)
@@ -251,4 +298,6 @@ g.insert_edge(d,e,7)
 g.insert_edge(b,e,6)
 
 
-DAG_Shortest_Path(g,a)
\ No newline at end of file
+DAG_Shortest_Path(g,a)
+D,index = Batched_DAG_Shortest_Paths(g,[a,c])
+D_longest,index = Batched_DAG_Longest_Paths(g,[a,c])
@@ -0,0 +1,489 @@
+"""Author - Anantvir Singh, differential testing of every shortest path engine in this repository against a reference Bellman-Ford"""
+
+# Every engine must give the same distances on the same graph, so a new (faster) engine can be trusted once it agrees with all the others on
+# lots of random graphs. Run_Differential() :
+#   1) generates random directed graphs of 5 kinds --> non_negative, negative_no_cycle, dag, unreachable (several pieces, many pairs with no
+#      path) and negative_cycle (random negative weights, cycles allowed)
+#   2) runs every engine that is applicable to that graph (Dijkstra only for non negative weights, DAG only for DAGs, all pairs engines only
+#      without negative cycles ....) from every source
+#   3) compares distances with a reference Bellman-Ford, checks the predecessor tree of engines that record one (parent of v is a real edge
+#      with dist[parent] + w = dist[v] and the parents lead back to s) and checks that the Bellman-Ford engines report a negative weight cycle
+#      exactly when one is reachable from s
+#   4) shrinks every failing graph to a minimal one (drop vertices, drop edges, move weights towards 0 while the same engine still fails)
+# Some engines have an extra check on top of the distances, e.g. the k / radius / targets stops of Dijkstra_Query() or the path returned by
+# Yen_K_Shortest_Paths(). Snapshot_Dijkstra() runs after a Save_Snapshot() --> Load_Snapshot() round trip.
+# Benchmark() runs the same engines on random graphs and reports the mean time per engine, so it doubles as a micro-benchmark.
+# Running this file checks every engine and exits with status 1 (printing each minimal failing graph) if any engine disagrees.
+#
+# A graph is described engine independently as spec = (n, {(i,j) : w}), vertices 0 .. n-1, and rebuilt with the Graph class of each module.
+
+import asyncio
+import contextlib
+import importlib.util
+import io
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:                   # the scripts import each other (from Dijkstras_Algorithm import Graph), also when run from elsewhere
+    sys.path.insert(0,_HERE)
+
+def _load(filename):
+    """Imports a script of this repository by file name (Bellman-Ford.py etc. are not valid module names). Their example at the bottom runs once"""
+    name = os.path.splitext(filename)[0].replace('-','_') + '_harness'
+    spec = importlib.util.spec_from_file_location(name,os.path.join(_HERE,filename))
+    module = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(module)
+    return module
+
+bellman_ford = _load('Bellman-Ford.py')
+dag = _load('DAG_Shortest_Paths.py')
+dijkstra = _load('Dijkstras_Algorithm.py')
+floyd_warshall = _load('Floyd-Warshall-Algorithm.py')
+slow_all_pairs = _load('Slow_AllPair_Shortest_Path.py')
+scc = _load('Strongly_Connected_Components.py')
+sparse_all_pairs = _load('Sparse_All_Pairs_Shortest_Path.py')
+service = _load('Async_Query_Service.py')
+external = _load('External_Floyd_Warshall.py')
+snapshot = _load('Graph_Snapshot.py')
+k_shortest = _load('K_Shortest_Paths.py')
+
+KINDS = ('non_negative','negative_no_cycle','dag','unreachable','negative_cycle')
+
+# ------------------------------------- Random graphs ----------------------------------------------
+
+def Random_Graph(rng,kind,max_n = 8,n = None):
+    n = n if n is not None else rng.randint(1,max_n)
+    p = rng.uniform(0.1,0.6)                                # edge density
+    edges = {}
+    if kind == 'non_negative':
+        for i in range(n):
+            for j in range(n):
+                if i != j and rng.random() < p:
+                    edges[(i,j)] = rng.randint(0,20)
+    elif kind == 'negative_no_cycle':                       # w(i,j) = base + phi[i] - phi[j] --> every cycle weighs sum(base) >= 0
+        phi = [rng.randint(0,10) for x in range(n)]
+        for i in range(n):
+            for j in range(n):
+                if i != j and rng.random() < p:
+                    edges[(i,j)] = rng.randint(0,10) + phi[i] - phi[j]
+    elif kind == 'dag':                                     # edges only go forward in a random order of the vertices
+        order = list(range(n))
+        rng.shuffle(order)
+        for a in range(n):
+            for b in range(a + 1,n):
+                if rng.random() < p:
+                    edges[(order[a],order[b])] = rng.randint(-10,20)
+    elif kind == 'unreachable':                             # pieces with edges inside a piece or towards a later piece only
+        piece = [rng.randint(0,2) for x in range(n)]
+        for i in range(n):
+            for j in range(n):
+                if i != j and piece[i] <= piece[j] and rng.random() < (p if piece[i] == piece[j] else p/4):
+                    edges[(i,j)] = rng.randint(0,20)
+    elif kind == 'negative_cycle':
+        for i in range(n):
+            for j in range(n):
+                if i != j and rng.random() < p:
+                    edges[(i,j)] = rng.randint(-5,15)
+    else:
+        raise ValueError('Unknown graph kind: %r' % kind)
+    return (n,edges)
+
+
+def Reference_Bellman_Ford(spec,s):
+    """Returns (dist list, True if a negative weight cycle is reachable from s). dist is meaningless when the flag is True"""
+    n,edges = spec
+    dist = [math.inf]*n
+    dist[s] = 0
+    for i in range(n - 1):
+        for (u,v),w in edges.items():
+            if dist[u] + w < dist[v]:
+                dist[v] = dist[u] + w
+    negative_cycle = any(dist[u] + w < dist[v] for (u,v),w in edges.items())
+    return dist,negative_cycle
+
+
+def _properties(spec):
+    n,edges = spec
+    reference = [Reference_Bellman_Ford(spec,s) for s in range(n)]
+    indegree = [0]*n                                        # Kahn's algorithm to check for a DAG
+    for (u,v) in edges:
+        indegree[v] += 1
+    ready = [v for v in range(n) if indegree[v] == 0]
+    seen = 0
+    while ready:
+        u = ready.pop()
+        seen += 1
+        for (a,b) in edges:
+            if a == u:
+                indegree[b] -= 1
+                if indegree[b] == 0:
+                    ready.append(b)
+    return {'n' : n,
+            'non_negative' : all(w >= 0 for w in edges.values()),
+            'dag' : seen == n,
+            'negative_cycle' : any(flag for dist,flag in reference),
+            'reference' : reference}
+
+# ------------------------------------- Engines ----------------------------------------------------
+# run(spec) returns {s : (dist list, parent list or None, negative cycle flag or None)} for every source s
+
+def _build(module,spec):
+    n,edges = spec
+    G = module.Graph(directed = True)
+    vertices = [G.insert_vertex(i) for i in range(n)]
+    for (u,v),w in edges.items():
+        G.insert_edge(vertices[u],vertices[v],w)
+    return G,vertices
+
+def _single_source(module,engine,dist_attr = '_d',parent_attr = '_parent'):
+    def run(spec):
+        G,vertices = _build(module,spec)
+        index = {v : i for i,v in enumerate(vertices)}
+        results = {}
+        for s,source in enumerate(vertices):
+            flag = engine(G,source)
+            dist = [getattr(v,dist_attr) for v in vertices]
+            parent = [index.get(getattr(v,parent_attr)) for v in vertices]
+            results[s] = (dist,parent,flag)
+        return results
+    return run
+
+def _dijkstra_query(spec):
+    G,vertices = _build(dijkstra,spec)
+    index = {v : i for i,v in enumerate(vertices)}
+    results = {}
+    for s,source in enumerate(vertices):
+        dist = [math.inf]*len(vertices)
+        parent = [None]*len(vertices)
+        for v,d in dijkstra.Dijkstra_Query(G,source):
+            dist[index[v]] = d
+            parent[index[v]] = index.get(v._parent)
+        results[s] = (dist,parent,None)
+    return results
+
+def _single_source_distances(spec):
+    G,vertices = _build(dijkstra,spec)
+    results = {}
+    for s,source in enumerate(vertices):
+        found = service.Single_Source_Distances(G,source)
+        results[s] = ([found.get(v,math.inf) for v in vertices],None,None)
+    return results
+
+def _batched_dag(spec):
+    G,vertices = _build(dag,spec)
+    D,index = dag.Batched_DAG_Shortest_Paths(G,vertices)
+    return {s : ([D[index[v]][s].item() for v in vertices],None,None) for s in range(len(vertices))}
+
+def _batched_dag_longest(spec):
+    """Longest paths on the graph with every weight negated = - shortest paths on the original graph, so the same reference applies"""
+    n,edges = spec
+    G,vertices = _build(dag,(n,{key : -w for key,w in edges.items()}))
+    D,index = dag.Batched_DAG_Longest_Paths(G,vertices)
+    return {s : ([-D[index[v]][s].item() for v in vertices],None,None) for s in range(len(vertices))}
+
+def _dijkstra_query_stops(spec,props):
+    """Every stopping rule of Dijkstra_Query() must yield exactly the vertices it promises, with their correct distances"""
+    G,vertices = _build(dijkstra,spec)
+    index = {v : i for i,v in enumerate(vertices)}
+    n = len(vertices)
+    for s,source in enumerate(vertices):
+        expected = props['reference'][s][0]
+        reachable = sorted(expected[v] for v in range(n) if expected[v] != math.inf)
+
+        def query(**kwargs):
+            return [(index[v],d) for v,d in dijkstra.Dijkstra_Query(G,source,**kwargs)]
+
+        for k in range(0,n + 2):
+            got = query(k = k)
+            if sorted(d for v,d in got) != reachable[:k] or any(not _same(d,expected[v]) for v,d in got):
+                return 'Dijkstra_Query from %d with k = %d yielded %r' % (s,k,got)
+        for radius in set(reachable) | {-1}:
+            got = query(radius = radius)
+            if sorted(v for v,d in got) != [v for v in range(n) if expected[v] <= radius]:
+                return 'Dijkstra_Query from %d with radius = %r yielded %r' % (s,radius,got)
+        for targets in [[]] + [[t] for t in range(n)] + [list(range(n))]:
+            got = query(targets = [vertices[t] for t in targets])
+            settled = {v for v,d in got}
+            wanted = {t for t in targets if expected[t] != math.inf}
+            if not wanted <= settled or any(not _same(d,expected[v]) for v,d in got):
+                return 'Dijkstra_Query from %d with targets = %r yielded %r' % (s,targets,got)
+            if targets and wanted == set(targets) and got[-1][0] not in wanted:    # must stop as soon as the last target is settled
+                return 'Dijkstra_Query from %d with targets = %r did not stop at the last target: %r' % (s,targets,got)
+            if not targets and got:
+                return 'Dijkstra_Query from %d with no targets yielded %r' % (s,got)
+    return None
+
+def _matrix_results(D,n):
+    return {s : ([D[s][v] for v in range(n)],None,None) for s in range(n)}
+
+def _padded_matrix(spec):                                   # 1-indexed matrix with dummy row/column 0 as used by the original scripts
+    n,edges = spec
+    W = [[0]*(n + 1)] + [[0] + [0 if i == j else math.inf for j in range(n)] for i in range(n)]
+    for (u,v),w in edges.items():
+        W[u + 1][v + 1] = w
+    return W
+
+def _floyd_warshall(spec):
+    D = floyd_warshall.Floyd_Warshall(_padded_matrix(spec))
+    return _matrix_results([row[1:] for row in D[1:]],spec[0])
+
+def _slow_all_pairs(spec):
+    D = slow_all_pairs.Slow_All_Pairs_Shortest_Path(_padded_matrix(spec))
+    return _matrix_results([row[1:] for row in D[1:]],spec[0])
+
+def _sparse_floyd_warshall(spec):
+    G,vertices = _build(floyd_warshall,spec)
+    W,order = floyd_warshall.Graph_To_Matrix(G)
+    return _matrix_results(floyd_warshall.Sparse_Floyd_Warshall(W).tolist(),spec[0])
+
+def _condensed_all_pairs(spec):
+    G,vertices = _build(dijkstra,spec)
+    result = scc.Condensed_All_Pairs_Shortest_Paths(G)
+    return {s : ([result.distance(u,v) for v in vertices],None,None) for s,u in enumerate(vertices)}
+
+def _external_floyd_warshall(spec):
+    G,vertices = _build(dijkstra,spec)
+    work_dir = tempfile.mkdtemp()
+    try:
+        tm,order = external.Graph_To_Tiled_Matrix(G,os.path.join(work_dir,'D.bin'),tile_size = 3,workers = 2)
+        external.External_Floyd_Warshall(tm,workers = 2)
+        D = tm.to_array().tolist()
+        del tm
+    finally:
+        shutil.rmtree(work_dir)
+    return _matrix_results(D,spec[0])
+
+def _streamed_all_pairs(spec):
+    G,vertices = _build(dijkstra,spec)
+    index = {v : i for i,v in enumerate(vertices)}
+    D = [[math.inf]*len(vertices) for x in vertices]
+    for u,v,d in sparse_all_pairs.All_Pairs_Shortest_Paths_Stream(G,include_self = True):
+        D[index[u]][index[v]] = d
+    return _matrix_results(D,spec[0])
+
+def _snapshot_dijkstra(spec):
+    """Save_Snapshot() --> Load_Snapshot() round trip first, so the CSR file format is checked together with the search"""
+    G,vertices = _build(dijkstra,spec)
+    work_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(work_dir,'graph.snap')
+        snapshot.Save_Snapshot(G,path)
+        with snapshot.Load_Snapshot(path) as snap:
+            found = [snapshot.Snapshot_Dijkstra(snap,s) for s in range(snap.vertex_count())]
+    finally:
+        shutil.rmtree(work_dir)
+    return {s : ([found[s].get(v,math.inf) for v in range(len(vertices))],None,None) for s in range(len(vertices))}
+
+def _yen_first_path(spec):
+    """Cost of the first path of Yen_K_Shortest_Paths() for every (s, t) pair, infinity when it finds no path"""
+    G,vertices = _build(k_shortest,spec)
+    results = {}
+    for s,source in enumerate(vertices):
+        dist = []
+        for target in vertices:
+            paths = k_shortest.Yen_K_Shortest_Paths(G,source,target,1)
+            dist.append(paths[0][0] if paths else math.inf)
+        results[s] = (dist,None,None)
+    return results
+
+def _yen_first_path_is_real(spec,props):
+    """The first path must go from s to t along real edges and its edge weights must add up to the reported cost"""
+    n,edges = spec
+    G,vertices = _build(k_shortest,spec)
+    index = {v : i for i,v in enumerate(vertices)}
+    for s,source in enumerate(vertices):
+        for t,target in enumerate(vertices):
+            for cost,path in k_shortest.Yen_K_Shortest_Paths(G,source,target,1):
+                ids = [index[v] for v in path]
+                if ids[0] != s or ids[-1] != t or any(pair not in edges for pair in zip(ids,ids[1:])):
+                    return 'Yen_K_Shortest_Paths from %d to %d returned %r, not a path of the graph' % (s,t,ids)
+                if not _same(sum(edges[pair] for pair in zip(ids,ids[1:])),cost):
+                    return 'Yen_K_Shortest_Paths from %d to %d returned cost %r for path %r' % (s,t,cost,ids)
+    return None
+
+def _service_query(spec):
+    """Every (s, t) pair asked at once through Shortest_Path_Service.query(), so queries from the same source are coalesced"""
+    G,vertices = _build(dijkstra,spec)
+
+    async def ask_all():
+        async with service.Shortest_Path_Service(G,num_workers = 2,max_pending = 4) as sp:
+            return await asyncio.gather(*[sp.query(s,t) for s in vertices for t in vertices])
+
+    answers = asyncio.run(ask_all())
+    n = len(vertices)
+    return {s : (answers[s*n:(s + 1)*n],None,None) for s in range(n)}
+
+
+class Engine:
+    def __init__(self,name,run,applicable,checks_negative_cycle = False,extra_check = None):
+        self.name = name
+        self.run = run
+        self.applicable = applicable                        # properties of the graph --> True if this engine may be run on it
+        self.checks_negative_cycle = checks_negative_cycle  # engine returns a flag (True = no negative cycle) like Bellman_Ford()
+        self.extra_check = extra_check                      # (spec, properties) --> None or a message, run after the distances agree
+
+_no_negative_cycle = lambda props : not props['negative_cycle']
+
+ENGINES = [
+    Engine('Dijkstra',_single_source(dijkstra,dijkstra.Dijkstra),lambda props : props['non_negative']),
+    Engine('Dijkstra_Query',_dijkstra_query,lambda props : props['non_negative'],extra_check = _dijkstra_query_stops),
+    Engine('Single_Source_Distances',_single_source_distances,lambda props : props['non_negative']),
+    Engine('Snapshot_Dijkstra',_snapshot_dijkstra,lambda props : props['non_negative']),
+    Engine('Shortest_Path_Service.query',_service_query,lambda props : props['non_negative']),
+    Engine('Yen_K_Shortest_Paths',_yen_first_path,lambda props : props['non_negative'],extra_check = _yen_first_path_is_real),
+    Engine('Bellman_Ford',_single_source(bellman_ford,bellman_ford.Bellman_Ford),lambda props : True,checks_negative_cycle = True),
+    Engine('Component_Bellman_Ford',_single_source(scc,scc.Component_Bellman_Ford),lambda props : True,checks_negative_cycle = True),
+    Engine('DAG_Shortest_Path',_single_source(dag,dag.DAG_Shortest_Path,'dist','parent'),lambda props : props['dag']),
+    Engine('Batched_DAG_Shortest_Paths',_batched_dag,lambda props : props['dag']),
+    Engine('Batched_DAG_Longest_Paths',_batched_dag_longest,lambda props : props['dag']),
+    Engine('Floyd_Warshall',_floyd_warshall,_no_negative_cycle),
+    Engine('Slow_All_Pairs_Shortest_Path',_slow_all_pairs,lambda props : not props['negative_cycle'] and props['n'] >= 3),    # its m loop needs n >= 3
+    Engine('Sparse_Floyd_Warshall',_sparse_floyd_warshall,_no_negative_cycle),
+    Engine('Condensed_All_Pairs_Shortest_Paths',_condensed_all_pairs,_no_negative_cycle),
+    Engine('External_Floyd_Warshall',_external_floyd_warshall,_no_negative_cycle),
+    Engine('All_Pairs_Shortest_Paths_Stream',_streamed_all_pairs,lambda props : props['non_negative']),
+]
+
+# ------------------------------------- Checking ---------------------------------------------------
+
+def _same(a,b):
+    if a == math.inf or b == math.inf:
+        return a == b
+    return math.isclose(a,b,rel_tol = 1e-6,abs_tol = 1e-6)
+
+def Check_Engine(engine,spec,props = None):
+    """Runs one engine on one graph. Returns None if it agrees with the reference, else a message describing the first disagreement"""
+    props = props or _properties(spec)
+    n,edges = spec
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):     # some of the original scripts print while they run
+            results = engine.run(spec)
+    except Exception as exc:
+        return '%s raised %s: %s' % (engine.name,type(exc).__name__,exc)
+    for s in range(n):
+        expected,negative_cycle = props['reference'][s]
+        dist,parent,flag = results[s]
+        if engine.checks_negative_cycle and flag != (not negative_cycle):
+            return '%s from %d: returned %r but a negative cycle is %sreachable' % (engine.name,s,flag,'' if negative_cycle else 'not ')
+        if negative_cycle:                                  # distances are undefined
+            continue
+        for v in range(n):
+            if not _same(dist[v],expected[v]):
+                return '%s from %d: dist[%d] = %r, expected %r' % (engine.name,s,v,dist[v],expected[v])
+        if parent is None:
+            continue
+        for v in range(n):
+            if v == s or expected[v] == math.inf:
+                continue
+            p = parent[v]
+            if p is None or (p,v) not in edges or not _same(expected[p] + edges[(p,v)],expected[v]):
+                return '%s from %d: parent[%d] = %r is not on a shortest path' % (engine.name,s,v,p)
+            steps = 0
+            while v != s and steps <= n:                    # the parents must lead back to s without a cycle
+                v = parent[v]
+                steps += 1
+                if v is None:
+                    break
+            if v != s:
+                return '%s from %d: parent pointers do not lead back to the source' % (engine.name,s)
+    if engine.extra_check is not None:
+        try:
+            return engine.extra_check(spec,props)
+        except Exception as exc:
+            return '%s check raised %s: %s' % (engine.name,type(exc).__name__,exc)
+    return None
+
+
+def Shrink(engine,spec):
+    """Greedily makes a failing graph smaller while engine still fails on it : remove vertices, then edges, then move weights towards 0"""
+    def fails(candidate):
+        props = _properties(candidate)
+        return engine.applicable(props) and Check_Engine(engine,candidate,props) is not None
+
+    improved = True
+    while improved:
+        improved = False
+        n,edges = spec
+        for x in range(n):                                  # remove vertex x and renumber the ones after it
+            candidate = (n - 1,{(u - (u > x),v - (v > x)) : w for (u,v),w in edges.items() if u != x and v != x})
+            if fails(candidate):
+                spec,improved = candidate,True
+                break
+        if improved:
+            continue
+        for key in list(edges):
+            candidate = (n,{k : w for k,w in edges.items() if k != key})
+            if fails(candidate):
+                spec,improved = candidate,True
+                break
+        if improved:
+            continue
+        for key,w in edges.items():
+            for smaller in (0,int(w/2)):
+                if smaller != w:
+                    candidate = (n,dict(edges))
+                    candidate[1][key] = smaller
+                    if fails(candidate):
+                        spec,improved = candidate,True
+                        break
+            if improved:
+                break
+    return spec
+
+
+def Run_Differential(trials = 200,seed = 0,max_n = 8,engines = None,kinds = KINDS):
+    """Returns a list of (engine name, graph kind, minimal failing spec, message), empty when every engine agrees on every graph"""
+    rng = random.Random(seed)
+    engines = engines or ENGINES
+    failures = []
+    failed = set()
+    for trial in range(trials):
+        kind = kinds[trial % len(kinds)]
+        spec = Random_Graph(rng,kind,max_n)
+        props = _properties(spec)
+        for engine in engines:
+            if engine.name in failed or not engine.applicable(props):      # report each broken engine once
+                continue
+            if Check_Engine(engine,spec,props) is not None:
+                minimal = Shrink(engine,spec)
+                failures.append((engine.name,kind,minimal,Check_Engine(engine,minimal)))
+                failed.add(engine.name)
+    return failures
+
+# ------------------------------------- Micro-benchmark --------------------------------------------
+
+def Benchmark(sizes = (8,16,32),kinds = ('non_negative','negative_no_cycle','dag'),graphs = 3,seed = 0,engines = None):
+    """Mean time in ms for each engine to compute distances from every source. Returns [(engine, kind, n, mean ms)]"""
+    rng = random.Random(seed)
+    engines = engines or ENGINES
+    table = []
+    for n in sizes:
+        for kind in kinds:
+            specs = [Random_Graph(rng,kind,n = n) for x in range(graphs)]
+            props = [_properties(spec) for spec in specs]
+            for engine in engines:
+                timed = [spec for spec,p in zip(specs,props) if engine.applicable(p)]
+                if not timed:
+                    continue
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for spec in timed:
+                        engine.run(spec)
+                table.append((engine.name,kind,n,(time.perf_counter() - start)*1000/len(timed)))
+    return table
+
+
+if __name__ == '__main__':
+    failures = Run_Differential(trials = 200)
+    for name,kind,spec,message in failures:
+        print('FAILED %s on a %s graph, minimal graph %r : %s' % (name,kind,spec,message))
+    if failures:
+        sys.exit(1)
+    print('All engines agree')
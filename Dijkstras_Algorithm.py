@@ -4,6 +4,7 @@
 # Dijkstra runs INITIALIZE-SINGLE-SOURCE() and then extracts min from heap and relaxes all edges leaving the extracted vertex
 
 # --------------------------- Adjaceny Map Representation of a Graph ----------------------------------------
+import heapq
 import math
 class Vertex:
     def __init__(self,x,parent = None,d = None):
@@ -165,10 +166,14 @@ def Dijkstra(G,s):          # s= source vertex
     adj_map = G.get_adj_map()   # Adjacency Map
     for v in vertices:
         h.insert_heap(v)        
+    settled = set()             # same vertices as S, kept as a set for O(1) membership checks
     while not h.is_Empty():
         u = h.delete_heap()     # Extract-Min from heap
         S.append(u)             
+        settled.add(u)
         for v in adj_map[u]:
+            if v in settled:    # v is already out of the heap and its distance is final
+                continue
             w_uv = adj_map[u][v]._element
             Relax(u,v,w_uv)     # Relax all edges leaving u which we get by Extract-Min
             """Decrease_Key() is basically Re-Heaping the vertex v"""
@@ -177,8 +182,70 @@ def Dijkstra(G,s):          # s= source vertex
 def Relax(u,v,w_uv):
     if v._d > u._d + w_uv:
         v._d = u._d + w_uv
+        v._parent = u           # u is the predecessor of v on the shortest path found so far
 
 
+"""Dijkstra on heapq with lazy deletion. Min_Heap finds a vertex with TREE.index() (a scan of the whole heap) in insert_heap() and
+Decrease_Key(), which makes big searches quadratic in the heap size. Here a better distance just pushes a new (distance, counter, vertex)
+entry, and old entries of an already settled vertex are skipped when they are popped --> O((V + E)lgV).
+neighbours(u) must give (v, w_uv) pairs, so the same search works on a Graph, on a snapshot's CSR arrays ....
+Yields (vertex, distance, parent) in the order vertices are settled. Distances live in local dicts, nothing is written on the vertices"""
+def Lazy_Dijkstra(s,neighbours):
+    dist = {s : 0}
+    parent = {s : None}
+    settled = set()
+    heap = [(0,0,s)]            # counter breaks ties, so vertices themselves are never compared
+    counter = 0
+    while heap:
+        d_u,_,u = heapq.heappop(heap)     # Extract-Min
+        if u in settled:                  # stale entry, u was already extracted with a smaller distance
+            continue
+        settled.add(u)
+        yield (u,d_u,parent[u])
+        for v,w_uv in neighbours(u):
+            if v in settled:
+                continue
+            if v not in dist or dist[v] > d_u + w_uv:     # Relax(u,v,w_uv)
+                dist[v] = d_u + w_uv
+                parent[v] = u
+                counter += 1
+                heapq.heappush(heap,(dist[v],counter,v))
+
+
+"""Bounded Dijkstra --> vertices only enter the heap when they are first discovered (instead of all |V| up front) and are yielded as
+(vertex, distance) in the order they are settled, so the caller can stop consuming at any time.
+Optional stopping rules:
+    targets --> stop once every vertex in targets has been settled
+    radius  --> stop at the first vertex whose distance is more than radius (it is not yielded)
+    k       --> stop after the k nearest vertices (source included) have been settled
+Only the settled vertices get their _d and _parent written, so a query that stops early never touches the rest of the graph"""
+def Dijkstra_Query(G,s,targets = None,radius = None,k = None):
+    adj_map = G.get_adj_map()
+    remaining = set(targets) if targets is not None else None
+    if (k is not None and k < 1) or remaining == set():     # nothing asked for --> nothing to settle
+        return
+    count = 0
+    for u,d,p in Lazy_Dijkstra(s,lambda u : ((v,e._element) for v,e in adj_map[u].items())):
+        if radius is not None and d > radius:
+            return
+        u._d = d
+        u._parent = p
+        yield (u,d)
+        count += 1
+        if k is not None and count >= k:
+            return
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                return
+
+
+"""{vertex : distance} for every vertex reachable from s (unreachable vertices are simply not in the dict). Unlike Dijkstra() nothing is written
+on the shared vertices, so several searches can run at the same time on the same graph (see Shortest_Path_Service)"""
+def Single_Source_Distances(G,s):
+    adj_map = G.get_adj_map()
+    return {u : d for u,d,p in Lazy_Dijkstra(s,lambda u : ((v,e._element) for v,e in adj_map[u].items()))}
+
 gr = Graph(directed=True)
 s = gr.insert_vertex('s')
 t = gr.insert_vertex('t')
@@ -198,3 +265,6 @@ gr.insert_edge(z,x,6)
 gr.insert_edge(z,s,7)
 
 Dijkstra(gr,s)
+nearest = list(Dijkstra_Query(gr,s,k = 3))            # 3 nearest vertices from s
+within_radius = list(Dijkstra_Query(gr,s,radius = 7))  # all vertices within distance 7 of s
+to_target = list(Dijkstra_Query(gr,s,targets = [x]))   # stops as soon as x is settled
@@ -0,0 +1,200 @@
+"""Author - Anantvir Singh, concept reference:= CLRS Page 695 (Floyd-Warshall), Venkataraman et al. 2003 (Blocked all pairs shortest paths)"""
+
+# Floyd_Warshall() keeps the whole n x n matrix in memory, for n = 100000 a float32 matrix alone is 40 GB. Here the matrix lives in a file and is
+# cut into B x B tiles, tile (I,J) holding rows I*B .. I*B+B-1 and columns J*B .. J*B+B-1. The file is tile major (every tile is contiguous on
+# disk) and is opened with np.memmap, so only the tiles being worked on have to be in RAM.
+#
+# Blocked Floyd-Warshall does the k loop one block of B values of k at a time. For block K :
+#   Phase 1 --> plain Floyd-Warshall inside the diagonal tile (K,K)
+#   Phase 2 --> tiles in row K and column K, they only need themselves and the diagonal tile
+#   Phase 3 --> every other tile (I,J) : D_IJ = min(D_IJ, D_IK (min,+) D_KJ). These tiles are independent, so they run in parallel threads
+#               (numpy releases the GIL inside np.minimum and +, so the threads really use several cores)
+# This gives exactly the same result as Floyd_Warshall() (graph without negative weight cycles).
+#
+# After each block K the memmap is flushed and the number of finished blocks is written to the .meta file next to the matrix, so after a
+# crash External_Floyd_Warshall() continues from the last finished block. Redoing a block that was half written is safe : every entry is
+# always the length of some real path and the updates only ever take minimums, so the final result is the same.
+# To resume, reopen the existing file instead of creating it again (Create_Tiled_Matrix() starts from an empty matrix) :
+#       tm,vertices = Graph_To_Tiled_Matrix(G,path,resume = True)       or       tm = Open_Or_Create_Tiled_Matrix(path,n)
+#       External_Floyd_Warshall(tm)
+
+import json
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from Dijkstras_Algorithm import Graph
+
+"""Largest tile size B such that every worker can hold its 3 phase 3 tiles (D_IJ, D_IK, D_KJ) plus one temporary tile within ram_budget_bytes"""
+def Tile_Size_For_Budget(ram_budget_bytes,workers,dtype = np.float32):
+    B = int(math.sqrt(ram_budget_bytes/(4*workers*np.dtype(dtype).itemsize)))
+    if B < 1:
+        raise ValueError('RAM budget of %d bytes is too small for %d workers' % (ram_budget_bytes,workers))
+    return B
+
+
+class Tiled_Matrix:
+    """n x n distance matrix stored as nb x nb tiles of B x B in a memory mapped file. Rows/columns past n are padding (isolated vertices)"""
+    def __init__(self,path):
+        with open(path + '.meta') as f:
+            meta = json.load(f)
+        self.path = path
+        self.n = meta['n']
+        self.B = meta['B']
+        self.nb = meta['nb']
+        self.dtype = np.dtype(meta['dtype'])
+        self.completed = meta['completed']          # number of k blocks already done by External_Floyd_Warshall()
+        self.tiles = np.memmap(path,dtype = self.dtype,mode = 'r+',shape = (self.nb,self.nb,self.B,self.B))
+
+    def save_meta(self):
+        self.tiles.flush()                          # tiles must be on disk before the meta file says the block is done
+        tmp = self.path + '.meta.tmp'
+        with open(tmp,'w') as f:
+            json.dump({'n' : self.n,'B' : self.B,'nb' : self.nb,'dtype' : self.dtype.str,'completed' : self.completed},f)
+        os.replace(tmp,self.path + '.meta')         # atomic, the meta file is always either the old or the new version
+
+    def set_weight(self,i,j,w):                     # W[i][j] = min(W[i][j], w)
+        tile = self.tiles[i//self.B,j//self.B]
+        tile[i % self.B][j % self.B] = min(tile[i % self.B][j % self.B],w)
+
+    def distance(self,i,j):
+        return self.tiles[i//self.B,j//self.B,i % self.B,j % self.B].item()
+
+    def to_array(self):                             # whole n x n matrix in RAM, only for small n
+        return self.tiles.transpose(0,2,1,3).reshape(self.nb*self.B,self.nb*self.B)[:self.n,:self.n].copy()
+
+
+"""Creates the file for an n x n matrix with W[i][i] = 0 and infinity everywhere else, one tile at a time. The tile size is either given or the
+largest one that fits ram_budget_bytes with the given number of workers"""
+def Create_Tiled_Matrix(path,n,ram_budget_bytes = 1 << 30,workers = None,tile_size = None,dtype = np.float32):
+    workers = workers or os.cpu_count() or 1
+    B = min(tile_size or Tile_Size_For_Budget(ram_budget_bytes,workers,dtype),max(n,1))
+    nb = (n + B - 1)//B
+    tiles = np.memmap(path,dtype = dtype,mode = 'w+',shape = (nb,nb,B,B))
+    for I in range(nb):
+        for J in range(nb):
+            tile = np.full((B,B),math.inf,dtype = dtype)
+            if I == J:
+                np.fill_diagonal(tile,0)
+            tiles[I,J] = tile
+    tiles.flush()
+    del tiles
+    with open(path + '.meta','w') as f:
+        json.dump({'n' : n,'B' : B,'nb' : nb,'dtype' : np.dtype(dtype).str,'completed' : 0},f)
+    return Tiled_Matrix(path)
+
+
+"""Reopens the matrix at path if its .meta file exists (keeping every finished k block), else creates it with Create_Tiled_Matrix().
+Raises ValueError if the existing matrix is not n x n"""
+def Open_Or_Create_Tiled_Matrix(path,n,**kwargs):
+    if not os.path.exists(path + '.meta'):
+        return Create_Tiled_Matrix(path,n,**kwargs)
+    tm = Tiled_Matrix(path)
+    if tm.n != n:
+        raise ValueError('%s holds a %d x %d matrix, expected %d x %d' % (path,tm.n,tm.n,n,n))
+    return tm
+
+
+"""Same as Graph_To_Matrix() in Floyd-Warshall-Algorithm.py but written straight into a Tiled_Matrix, so the dense matrix never has to fit in RAM.
+Row/column i belongs to vertices[i], the order of G.vertices(). With resume = True an existing file at path is reopened instead of wiped (G
+must be the same graph as before the crash)"""
+def Graph_To_Tiled_Matrix(G,path,resume = False,**kwargs):
+    vertices = list(G.vertices())
+    index = {v : i for i,v in enumerate(vertices)}
+    adj_map = G.get_adj_map()
+    if resume:
+        tm = Open_Or_Create_Tiled_Matrix(path,len(vertices),**kwargs)
+        if tm.completed > 0:                        # edges were written before the first block started, nothing to load
+            return tm,vertices
+    else:
+        tm = Create_Tiled_Matrix(path,len(vertices),**kwargs)
+    for u in vertices:                              # (re)loading edges is safe, set_weight only takes minimums
+        for v in adj_map[u]:
+            tm.set_weight(index[u],index[v],adj_map[u][v]._element)
+    tm.save_meta()
+    return tm,vertices
+
+
+def _floyd_warshall_tile(D):                        # Phase 1
+    for k in range(len(D)):
+        np.minimum(D,D[:,k,None] + D[None,k,:],out = D)
+
+def _row_tile(D_KK,D_KJ):                           # Phase 2, tile in row K : paths i --> k (inside diagonal tile) --> j
+    for k in range(len(D_KK)):
+        np.minimum(D_KJ,D_KK[:,k,None] + D_KJ[None,k,:],out = D_KJ)
+
+def _column_tile(D_IK,D_KK):                        # Phase 2, tile in column K
+    for k in range(len(D_KK)):
+        np.minimum(D_IK,D_IK[:,k,None] + D_KK[None,k,:],out = D_IK)
+
+def _min_plus_tile(D_IJ,D_IK,D_KJ):                 # Phase 3, D_IJ = min(D_IJ, D_IK (min,+) D_KJ)
+    for k in range(len(D_IK)):
+        np.minimum(D_IJ,D_IK[:,k,None] + D_KJ[None,k,:],out = D_IJ)
+
+
+def External_Floyd_Warshall(tm,workers = None):
+    tiles = tm.tiles
+    nb = tm.nb
+    with ThreadPoolExecutor(max_workers = workers or os.cpu_count() or 1) as pool:
+
+        def update_row_tile(K,J,D_KK):
+            D_KJ = np.array(tiles[K,J])             # copy into RAM, work on it, write it back
+            _row_tile(D_KK,D_KJ)
+            tiles[K,J] = D_KJ
+
+        def update_column_tile(I,K,D_KK):
+            D_IK = np.array(tiles[I,K])
+            _column_tile(D_IK,D_KK)
+            tiles[I,K] = D_IK
+
+        def update_tile(I,J,K):
+            D_IK = np.array(tiles[I,K])
+            D_KJ = np.array(tiles[K,J])
+            if not (np.isfinite(D_IK).any() and np.isfinite(D_KJ).any()):      # no path through block K can improve this tile
+                return
+            D_IJ = np.array(tiles[I,J])
+            _min_plus_tile(D_IJ,D_IK,D_KJ)
+            tiles[I,J] = D_IJ
+
+        for K in range(tm.completed,nb):
+            D_KK = np.array(tiles[K,K])
+            _floyd_warshall_tile(D_KK)                                                      # Phase 1
+            tiles[K,K] = D_KK
+            jobs = [pool.submit(update_row_tile,K,J,D_KK) for J in range(nb) if J != K]     # Phase 2
+            jobs += [pool.submit(update_column_tile,I,K,D_KK) for I in range(nb) if I != K]
+            for job in jobs:
+                job.result()
+            jobs = [pool.submit(update_tile,I,J,K) for I in range(nb) if I != K for J in range(nb) if J != K]      # Phase 3
+            for job in jobs:
+                job.result()
+            tm.completed = K + 1
+            tm.save_meta()
+    return tm
+
+
+if __name__ == '__main__':
+    gr = Graph(directed=True)       # Graph same as on CLRS page 690 Figure 25.1
+    v_1 = gr.insert_vertex('1')
+    v_2 = gr.insert_vertex('2')
+    v_3 = gr.insert_vertex('3')
+    v_4 = gr.insert_vertex('4')
+    v_5 = gr.insert_vertex('5')
+
+    gr.insert_edge(v_1,v_2,3)
+    gr.insert_edge(v_1,v_3,8)
+    gr.insert_edge(v_1,v_5,-4)
+    gr.insert_edge(v_2,v_4,1)
+    gr.insert_edge(v_2,v_5,7)
+    gr.insert_edge(v_3,v_2,4)
+    gr.insert_edge(v_4,v_1,2)
+    gr.insert_edge(v_4,v_3,-5)
+    gr.insert_edge(v_5,v_4,6)
+
+    work_dir = tempfile.mkdtemp()
+    tm,vertex_order = Graph_To_Tiled_Matrix(gr,os.path.join(work_dir,'D.bin'),tile_size = 2,workers = 2)   # 3 x 3 tiles of 2 x 2
+    External_Floyd_Warshall(tm,workers = 2)
+    D = tm.to_array()
+    del tm
+    shutil.rmtree(work_dir)
@@ -27,6 +27,7 @@
 
 # --------------------------- Adjaceny Map Representation of a Graph ----------------------------------------
 import math
+import numpy as np
 class Vertex:
     def __init__(self,x):
         self._element = x
@@ -126,6 +127,41 @@ def Floyd_Warshall(W):
     return d_k
 
 
+"""Builds the weight matrix straight from the graph instead of typing it by hand. Row/column i belongs to vertices[i] where vertices is the order
+of G.vertices(), so the mapping is stable and there is no dummy row/column 0. W[i][i] = 0, W[i][j] = weight of edge (i,j), infinity if no edge"""
+def Graph_To_Matrix(G,dtype = np.float64):
+    vertices = list(G.vertices())
+    index = {v : i for i,v in enumerate(vertices)}
+    adj_map = G.get_adj_map()
+    W = np.full((len(vertices),len(vertices)),math.inf,dtype = dtype)
+    np.fill_diagonal(W,0)
+    for u in vertices:
+        for v in adj_map[u]:
+            i,j = index[u],index[v]
+            W[i][j] = min(W[i][j],adj_map[u][v]._element)      # min --> a negative self loop stays on the diagonal
+    return W,vertices
+
+
+"""Same recurrence as Floyd_Warshall() but on a 0-indexed numpy matrix (e.g. from Graph_To_Matrix()) and updated in place, since row k and
+column k do not change in iteration k. D[i][k] + D[k][j] can only improve D[i][j] when both are finite, so for each k only the rows i with
+D[i][k] finite and the columns j with D[k][j] finite are updated. On sparse or partially disconnected graphs most of the n x n block is skipped"""
+def Sparse_Floyd_Warshall(W):
+    W = np.asarray(W)                                       # also accepts a plain list of lists
+    D = np.array(W,dtype = np.result_type(W.dtype,np.float32))     # copy, W is left unchanged
+    n = len(D)
+    for k in range(n):
+        rows = np.flatnonzero(np.isfinite(D[:,k]))
+        cols = np.flatnonzero(np.isfinite(D[k,:]))
+        if len(rows) == 0 or len(cols) == 0:
+            continue
+        if len(rows) == n and len(cols) == n:              # nothing to skip, plain slices are cheaper than fancy indexing
+            np.minimum(D,D[:,k,None] + D[None,k,:],out = D)
+            continue
+        block = np.ix_(rows,cols)
+        D[block] = np.minimum(D[block],D[rows,k][:,None] + D[k,cols][None,:])
+    return D
+
+
 gr = Graph(directed=True)       # Graph same as on CLRS page 690 Figure 25.1
 v_1 = gr.insert_vertex('1')
 v_2 = gr.insert_vertex('2')
@@ -146,4 +182,5 @@ weight_matrix = [[0,0,0,0,0,0],[0,0,3,8,math.inf,-4],[0,math.inf,0,math.inf,1,7]
 
 Floyd_Warshall(weight_matrix)
 
-
+W,vertex_order = Graph_To_Matrix(gr)
+D = Sparse_Floyd_Warshall(W)
@@ -0,0 +1,220 @@
+"""Author - Anantvir Singh, snapshot file for a Graph so that a process can reload it instead of rebuilding it edge by edge"""
+
+# Building a graph with insert_vertex()/insert_edge() for every element is slow for big graphs and has to be repeated by every process.
+# Save_Snapshot() writes the graph once in CSR (Compressed Sparse Row) form :
+#   offsets[i] .. offsets[i+1]  --> positions in targets/weights of the edges leaving vertex i
+#   targets[p], weights[p]      --> destination id and weight of the p-th edge
+# Vertex ids are the positions of the vertices in G.vertices(). Precomputed artifacts (topological order, landmark tables ....) can be stored
+# next to the graph as extra named arrays.
+#
+# File layout (little endian, every section starts at a multiple of 64 bytes) :
+#   header        --> magic, format version, directed flag, |V|, |E|, number of sections
+#   section table --> one entry per section : name, numpy dtype, byte offset, byte length, number of columns (0 for 1-D arrays)
+#   sections      --> offsets, targets, weights, labels (JSON) and then the artifacts
+#
+# Load_Snapshot() mmaps the file and wraps each section with numpy.frombuffer, so nothing is copied or parsed at startup (labels are decoded
+# only when first used). The mapping is read only, so forked workers all share the same pages of the OS page cache.
+# Startup is O(1) only for code that works on offsets/targets/weights directly, like Snapshot_Dijkstra() below. to_graph() rebuilds Vertex and
+# Edge objects for the other engines and is O(V + E) again.
+# Weights are stored as int64 when every edge element is an int and as float64 otherwise. Tuple weights (see Pareto_Shortest_Paths()) are
+# not supported. Vertex elements are stored as JSON, so only strings, numbers, booleans and None are accepted (a tuple would come back as
+# a list and silently change the vertex elements).
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import numpy as np
+from Dijkstras_Algorithm import Graph, Vertex, Lazy_Dijkstra
+
+MAGIC = b'SPGSNAP\x00'
+VERSION = 1
+_HEADER = struct.Struct('<8sIIqqq')             # magic, version, directed, n, m, number of sections
+_SECTION = struct.Struct('<16s8sqqq')           # name, dtype, offset, nbytes, ncols
+_ALIGN = 64
+
+def _aligned(pos):
+    return (pos + _ALIGN - 1)//_ALIGN*_ALIGN
+
+
+def Save_Snapshot(G,path,artifacts = None):
+    vertices = list(G.vertices())
+    index = {v : i for i,v in enumerate(vertices)}
+    adj_map = G.get_adj_map()
+    n = len(vertices)
+    offsets = np.zeros(n + 1,dtype = np.int64)
+    for i,u in enumerate(vertices):
+        offsets[i + 1] = offsets[i] + len(adj_map[u])
+    m = int(offsets[n])
+    elements = [e.element() for u in vertices for e in adj_map[u].values()]
+    for w in elements:
+        if isinstance(w,bool) or not isinstance(w,(int,float,np.integer,np.floating)):
+            raise ValueError('Snapshot edge weights must be single numbers, got %r' % (w,))
+    all_int = all(isinstance(w,(int,np.integer)) for w in elements)
+    targets = np.empty(m,dtype = np.int64)
+    weights = np.empty(m,dtype = np.int64 if all_int else np.float64)     # keeps integer weights integers after reload
+    p = 0
+    for u in vertices:
+        for v,e in adj_map[u].items():
+            targets[p] = index[v]
+            weights[p] = e.element()
+            p += 1
+    for v in vertices:
+        if v.element() is not None and not isinstance(v.element(),(str,int,float)):
+            raise ValueError('Snapshot vertex elements must be strings, numbers, booleans or None, got %r' % (v.element(),))
+    labels = np.frombuffer(json.dumps([v.element() for v in vertices]).encode('utf-8'),dtype = np.uint8)
+
+    sections = [('offsets',offsets),('targets',targets),('weights',weights),('labels',labels)]
+    for name,value in (artifacts or {}).items():
+        if len(name.encode('utf-8')) > 16 or name in ('offsets','targets','weights','labels'):
+            raise ValueError('Invalid artifact name: %r' % name)
+        if not isinstance(value,np.ndarray) and len(value) > 0 and isinstance(value[0],Vertex):   # e.g. a topological order given as a list of vertices --> store vertex ids
+            value = np.array([index[v] for v in value],dtype = np.int64)
+        value = np.asarray(value)
+        if value.dtype.kind not in 'biuf':          # strings/objects would be written as raw bytes or pointers
+            raise ValueError('Artifact %r must be numeric, got dtype %s' % (name,value.dtype))
+        sections.append((name,np.ascontiguousarray(value)))
+
+    pos = _aligned(_HEADER.size + _SECTION.size*len(sections))
+    table = []
+    for name,arr in sections:
+        if arr.ndim > 2:
+            raise ValueError('Artifact %r has more than 2 dimensions' % name)
+        ncols = arr.shape[1] if arr.ndim == 2 else 0
+        table.append((name,arr,pos,ncols))
+        pos = _aligned(pos + arr.nbytes)
+
+    with open(path,'wb') as f:
+        f.write(_HEADER.pack(MAGIC,VERSION,int(G.is_directed()),n,m,len(sections)))
+        for name,arr,offset,ncols in table:
+            f.write(_SECTION.pack(name.encode('utf-8'),arr.dtype.str.encode('ascii'),offset,arr.nbytes,ncols))
+        for name,arr,offset,ncols in table:
+            f.seek(offset)
+            f.write(arr.tobytes())
+        f.truncate(pos)
+
+
+class Graph_Snapshot:
+    """Read only view of a snapshot file. offsets/targets/weights and every artifact are numpy arrays backed directly by the mmap"""
+    def __init__(self,path):
+        self._file = open(path,'rb')
+        if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+            self._file.close()
+            raise ValueError('%s is too short to be a graph snapshot' % path)
+        self._mmap = mmap.mmap(self._file.fileno(),0,access = mmap.ACCESS_READ)
+        magic,version,directed,n,m,num_sections = _HEADER.unpack_from(self._mmap,0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError('%s is not a graph snapshot' % path)
+        if version != VERSION:
+            self.close()
+            raise ValueError('Unsupported snapshot version %d (expected %d)' % (version,VERSION))
+        self.directed = bool(directed)
+        self.n = n
+        self.m = m
+        self.artifacts = {}
+        self._labels = None
+        for i in range(num_sections):
+            if _HEADER.size + (i + 1)*_SECTION.size > len(self._mmap):
+                self.close()
+                raise ValueError('%s is truncated (section table is incomplete)' % path)
+            name,dtype,offset,nbytes,ncols = _SECTION.unpack_from(self._mmap,_HEADER.size + i*_SECTION.size)
+            size = len(self._mmap)
+            if offset + nbytes > size:
+                self.close()
+                raise ValueError('%s is truncated (section %r needs bytes up to %d, file has %d)' % (path,name.rstrip(b'\x00').decode('utf-8'),offset + nbytes,size))
+            dtype = np.dtype(dtype.rstrip(b'\x00').decode('ascii'))
+            arr = np.frombuffer(self._mmap,dtype = dtype,count = nbytes//dtype.itemsize,offset = offset)    # zero copy
+            if ncols:
+                arr = arr.reshape(-1,ncols)
+            self.artifacts[name.rstrip(b'\x00').decode('utf-8')] = arr
+        self.offsets = self.artifacts.pop('offsets')
+        self.targets = self.artifacts.pop('targets')
+        self.weights = self.artifacts.pop('weights')
+        self._label_bytes = self.artifacts.pop('labels')
+
+    def vertex_count(self):
+        return self.n
+
+    def edge_count(self):
+        return self.m
+
+    def labels(self):                   # element of each vertex, decoded on first use
+        if self._labels is None:
+            self._labels = json.loads(self._label_bytes.tobytes().decode('utf-8'))
+        return self._labels
+
+    def neighbors(self,i):              # (destination ids, weights) of the edges leaving vertex i
+        lo,hi = self.offsets[i],self.offsets[i + 1]
+        return self.targets[lo:hi],self.weights[lo:hi]
+
+    def to_graph(self):
+        """Rebuild a normal Graph for code that needs Vertex/Edge objects. This is O(V + E), the same cost as building the graph by hand, so
+        use it only for engines that can not work on the CSR arrays. Returns the graph and its vertices indexed by id"""
+        G = Graph(directed = self.directed)
+        vertices = [G.insert_vertex(x) for x in self.labels()]
+        for i,u in enumerate(vertices):
+            for j,w in zip(*self.neighbors(i)):
+                G.insert_edge(u,vertices[j],w.item())
+        return G,vertices
+
+    def close(self):
+        self.offsets = self.targets = self.weights = self._label_bytes = None      # numpy views must go before the mmap can be closed
+        self.artifacts = {}
+        try:
+            self._mmap.close()
+        except BufferError:             # caller still holds arrays from this snapshot, the mapping is released when the last one is garbage collected
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,exc_type,exc,tb):
+        self.close()
+
+
+def Load_Snapshot(path):
+    return Graph_Snapshot(path)
+
+
+"""Lazy_Dijkstra() directly on the CSR arrays of a snapshot, so nothing has to be rebuilt after Load_Snapshot(). Vertices are ids, returns
+{id : distance} for every vertex reachable from s"""
+def Snapshot_Dijkstra(snap,s):
+    offsets,targets,weights = snap.offsets,snap.targets,snap.weights
+    def neighbours(u):
+        lo,hi = offsets[u],offsets[u + 1]
+        return zip(targets[lo:hi].tolist(),weights[lo:hi].tolist())     # plain ints/floats, not numpy scalars
+    return {u : d for u,d,p in Lazy_Dijkstra(s,neighbours)}
+
+
+if __name__ == '__main__':
+    gr = Graph(directed=True)       # Same graph as in Dijkstras_Algorithm.py
+    s = gr.insert_vertex('s')
+    t = gr.insert_vertex('t')
+    x = gr.insert_vertex('x')
+    y = gr.insert_vertex('y')
+    z = gr.insert_vertex('z')
+
+    gr.insert_edge(s,t,10)
+    gr.insert_edge(s,y,5)
+    gr.insert_edge(t,x,1)
+    gr.insert_edge(t,y,2)
+    gr.insert_edge(x,z,4)
+    gr.insert_edge(y,t,3)
+    gr.insert_edge(y,x,9)
+    gr.insert_edge(y,z,2)
+    gr.insert_edge(z,x,6)
+    gr.insert_edge(z,s,7)
+
+    snapshot_path = os.path.join(tempfile.mkdtemp(),'graph.snap')
+    Save_Snapshot(gr,snapshot_path,artifacts = {'landmarks' : np.array([[0,8,9,5,7],[7,0,1,2,4]],dtype = np.float32)})
+    with Load_Snapshot(snapshot_path) as snap:
+        labels = snap.labels()
+        out_of_s = [(labels[j],w) for j,w in zip(*snap.neighbors(0))]
+        distances_from_s = {labels[j] : d for j,d in Snapshot_Dijkstra(snap,0).items()}
+        landmarks = snap.artifacts['landmarks'].copy()
+        reloaded,reloaded_vertices = snap.to_graph()
+    os.remove(snapshot_path)
+    os.rmdir(os.path.dirname(snapshot_path))
@@ -0,0 +1,171 @@
+"""Author - Anantvir Singh, concept reference:= Yen 1971 (k shortest loopless paths), Martins 1984 (multi-criteria label setting)"""
+
+# Two ways of returning more than one route for a query s --> t :
+#
+# 1) Yen_K_Shortest_Paths() --> the K shortest loopless paths in order of total weight. Path k+1 is the cheapest of the "spur" paths of the
+#    paths found so far : for every vertex i on path k, keep the root path s..i, ban the edges leaving i that earlier paths with the same root
+#    used (and the root vertices themselves), and search for the shortest i --> t path in what is left.
+#    One reverse Dijkstra from t is done up front and its search tree is reused by every spur search :
+#       - dist_to_t[v] on the full graph is a lower bound on dist_to_t[v] in any graph with edges removed, so each spur search is an A* search
+#         guided by it and settles only a few vertices (the tree path itself is found in |path| steps when it is not banned)
+#       - vertices with no path to t at all are never explored
+#       - the first path is read directly off the tree
+#
+# 2) Pareto_Shortest_Paths() --> edges carry a tuple of 2 weights, e.g. (time, toll), and there is usually no single best path. The result is
+#    every Pareto optimal path, i.e. no other path is at least as good in both criteria. Labels (c1,c2) are settled in lexicographic order, so all
+#    settled labels at a vertex have c1 <= c1 of any label still in the queue, and a new label is dominated exactly when the smallest settled c2
+#    at that vertex (or at t) is <= its c2. Dominated labels are dropped right away, which bounds memory.
+#
+# Both need non negative edge weights, same as Dijkstra()
+
+import heapq
+import math
+from Dijkstras_Algorithm import Graph, Lazy_Dijkstra
+
+"""Dijkstra from t over the incoming edges. Returns (dist = {v : shortest distance from v to t}, nxt = {v : next vertex on that path})"""
+def _reverse_shortest_path_tree(G,t):
+    in_map = G._incoming
+    dist = {}
+    nxt = {}
+    for u,d,p in Lazy_Dijkstra(t,lambda v : ((u,e._element) for u,e in in_map[v].items())):    # parent in the reverse search = next vertex towards t
+        dist[u] = d
+        nxt[u] = p
+    return dist,nxt
+
+
+"""A* from spur to t that may not use banned_vertices or banned_edges. h = distances to t on the full graph (consistent heuristic).
+Returns (cost, path) or None if t can not be reached"""
+def _spur_search(G,spur,t,h,banned_vertices,banned_edges):
+    adj_map = G.get_adj_map()
+    g = {spur : 0}
+    parent = {spur : None}
+    settled = set()
+    heap = [(h[spur],id(spur),spur)]
+    while heap:
+        _,_,u = heapq.heappop(heap)
+        if u in settled:
+            continue
+        if u is t:
+            path = []
+            while u is not None:
+                path.append(u)
+                u = parent[u]
+            path.reverse()
+            return g[t],path
+        settled.add(u)
+        for v in adj_map[u]:
+            if v in banned_vertices or v not in h or (u,v) in banned_edges:     # v not in h --> v has no path to t
+                continue
+            w_uv = adj_map[u][v]._element
+            if v not in g or g[v] > g[u] + w_uv:
+                g[v] = g[u] + w_uv
+                parent[v] = u
+                heapq.heappush(heap,(g[v] + h[v],id(v),v))
+    return None
+
+
+def Yen_K_Shortest_Paths(G,s,t,K):
+    """Returns up to K (cost, path) tuples in non decreasing cost, path = list of vertices from s to t"""
+    adj_map = G.get_adj_map()
+    h,nxt = _reverse_shortest_path_tree(G,t)
+    if s not in h or K <= 0:
+        return []
+    path = [s]
+    while path[-1] is not t:                    # first path = walk the reverse tree from s
+        path.append(nxt[path[-1]])
+    A = [(h[s],path)]
+    B = []                                      # candidate heap of (cost, counter, path)
+    seen = {tuple(map(id,path))}
+    counter = 0
+    while len(A) < K:
+        prev = A[-1][1]
+        root_cost = 0
+        for i in range(len(prev) - 1):
+            spur = prev[i]
+            root = prev[:i + 1]
+            banned_edges = set()
+            for cost,p in A:
+                if len(p) > i and p[:i + 1] == root:
+                    banned_edges.add((p[i],p[i + 1]))
+            banned_vertices = set(root[:-1])    # keeps the total path loopless
+            found = _spur_search(G,spur,t,h,banned_vertices,banned_edges)
+            if found is not None:
+                total = root[:-1] + found[1]
+                key = tuple(map(id,total))
+                if key not in seen:
+                    seen.add(key)
+                    counter += 1
+                    heapq.heappush(B,(root_cost + found[0],counter,total))
+            root_cost += adj_map[prev[i]][prev[i + 1]]._element
+        if not B:
+            break
+        cost,_,path = heapq.heappop(B)
+        A.append((cost,path))
+    return A
+
+
+def Pareto_Shortest_Paths(G,s,t):
+    """Edge elements are (w1,w2) tuples. Returns every Pareto optimal ((c1,c2), path) from s to t, sorted by c1 (and so by decreasing c2)"""
+    adj_map = G.get_adj_map()
+    best_c2 = {}                                # vertex --> smallest c2 of its settled labels
+    heap = [(0,0,0,s,None)]                     # (c1, c2, counter, vertex, predecessor label)
+    counter = 0
+    results = []
+    while heap:
+        label = heapq.heappop(heap)
+        c1,c2,_,u,pred = label
+        if c2 >= best_c2.get(u,math.inf) or c2 >= best_c2.get(t,math.inf):     # dominated by a settled label at u, or by a path already found to t
+            continue
+        best_c2[u] = c2
+        if u is t:
+            path = []
+            node = label
+            while node is not None:
+                path.append(node[3])
+                node = node[4]
+            path.reverse()
+            results.append(((c1,c2),path))
+            continue
+        for v in adj_map[u]:
+            w1,w2 = adj_map[u][v]._element
+            n1,n2 = c1 + w1,c2 + w2
+            if n2 >= best_c2.get(v,math.inf) or n2 >= best_c2.get(t,math.inf):   # dominance pruning before the label is even stored
+                continue
+            counter += 1
+            heapq.heappush(heap,(n1,n2,counter,v,label))
+    return results
+
+
+gr = Graph(directed=True)       # Same graph as in Dijkstras_Algorithm.py
+s = gr.insert_vertex('s')
+t = gr.insert_vertex('t')
+x = gr.insert_vertex('x')
+y = gr.insert_vertex('y')
+z = gr.insert_vertex('z')
+
+gr.insert_edge(s,t,10)
+gr.insert_edge(s,y,5)
+gr.insert_edge(t,x,1)
+gr.insert_edge(t,y,2)
+gr.insert_edge(x,z,4)
+gr.insert_edge(y,t,3)
+gr.insert_edge(y,x,9)
+gr.insert_edge(y,z,2)
+gr.insert_edge(z,x,6)
+gr.insert_edge(z,s,7)
+
+three_shortest = Yen_K_Shortest_Paths(gr,s,x,3)
+
+roads = Graph(directed=True)    # edge element = (time, toll)
+a = roads.insert_vertex('a')
+b = roads.insert_vertex('b')
+c = roads.insert_vertex('c')
+d = roads.insert_vertex('d')
+
+roads.insert_edge(a,b,(1,5))
+roads.insert_edge(a,c,(3,0))
+roads.insert_edge(b,d,(1,5))
+roads.insert_edge(c,d,(3,0))
+roads.insert_edge(b,c,(1,0))
+
+time_vs_toll = Pareto_Shortest_Paths(roads,a,d)
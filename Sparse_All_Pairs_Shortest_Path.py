@@ -0,0 +1,91 @@
+"""Author - Anantvir Singh, concept reference:= CLRS Page 684 (All pairs shortest paths by running a single source algorithm |V| times)"""
+
+# Floyd_Warshall() and Slow_All_Pairs_Shortest_Path() need the full n x n weight matrix in memory and return another n x n matrix. For a sparse
+# graph it is cheaper to run one single source search per vertex (Lazy_Dijkstra() on heapq --> O(V(V + E)lgV), BFS for unweighted graphs --> O(V(V + E)))
+# and hand every (src, dst, dist) record to the caller as soon as it is found, instead of collecting them in a matrix.
+# Only one search is alive at a time, so memory stays O(V + E) however many records are produced.
+# Dijkstra needs non negative edge weights (use Bellman-Ford / Floyd-Warshall for negative weights).
+
+import csv
+import math
+import os
+from collections import deque
+from Dijkstras_Algorithm import Graph, Lazy_Dijkstra
+
+def BFS_Query(G,s):
+    """Breadth First Search from s, yields (vertex, number of edges from s) in the order vertices are discovered (non decreasing distance)"""
+    adj_map = G.get_adj_map()
+    dist = {s : 0}
+    Q = deque([s])
+    while Q:
+        u = Q.popleft()
+        yield (u,dist[u])
+        for v in adj_map[u]:
+            if v not in dist:
+                dist[v] = dist[u] + 1
+                Q.append(v)
+
+
+"""Yields (src, dst, dist) for every pair with min_distance <= dist <= max_distance. max_distance also stops each single source search early,
+since both searches produce vertices in non decreasing distance order --> vertices further than max_distance are never explored"""
+def All_Pairs_Shortest_Paths_Stream(G,max_distance = math.inf,min_distance = -math.inf,unweighted = False,include_self = False):
+    adj_map = G.get_adj_map()
+    neighbours = lambda u : ((v,e._element) for v,e in adj_map[u].items())
+    for s in list(G.vertices()):
+        if unweighted:
+            search = BFS_Query(G,s)
+        else:
+            search = ((v,d) for v,d,p in Lazy_Dijkstra(s,neighbours))
+        for v,d in search:
+            if d > max_distance:            # first vertex past max_distance ends this search, nothing further away is explored
+                break
+            if d < min_distance or (v is s and not include_self):
+                continue
+            yield (s,v,d)
+
+
+"""Writes the records of All_Pairs_Shortest_Paths_Stream() as CSV files of at most chunk_size rows each (src, dst, dist using vertex elements)
+and returns the list of file paths. Only the current chunk is open, nothing is buffered in memory"""
+def Write_All_Pairs_Chunks(G,directory,chunk_size = 1000000,prefix = 'all_pairs',**kwargs):
+    os.makedirs(directory,exist_ok = True)
+    paths = []
+    f = None
+    writer = None
+    rows = 0
+    try:
+        for s,v,d in All_Pairs_Shortest_Paths_Stream(G,**kwargs):
+            if writer is None or rows == chunk_size:
+                if f is not None:
+                    f.close()
+                paths.append(os.path.join(directory,'%s_%05d.csv' % (prefix,len(paths))))
+                f = open(paths[-1],'w',newline = '')
+                writer = csv.writer(f)
+                writer.writerow(['src','dst','dist'])
+                rows = 0
+            writer.writerow([s.element(),v.element(),d])
+            rows += 1
+    finally:
+        if f is not None:
+            f.close()
+    return paths
+
+
+gr = Graph(directed=True)       # Same graph as in Dijkstras_Algorithm.py
+s = gr.insert_vertex('s')
+t = gr.insert_vertex('t')
+x = gr.insert_vertex('x')
+y = gr.insert_vertex('y')
+z = gr.insert_vertex('z')
+
+gr.insert_edge(s,t,10)
+gr.insert_edge(s,y,5)
+gr.insert_edge(t,x,1)
+gr.insert_edge(t,y,2)
+gr.insert_edge(x,z,4)
+gr.insert_edge(y,t,3)
+gr.insert_edge(y,x,9)
+gr.insert_edge(y,z,2)
+gr.insert_edge(z,x,6)
+gr.insert_edge(z,s,7)
+
+pairs_within_5 = [(u.element(),v.element(),d) for u,v,d in All_Pairs_Shortest_Paths_Stream(gr,max_distance = 5)]
@@ -0,0 +1,198 @@
+"""Author - Anantvir Singh, concept reference:= CLRS Page 615 (Strongly connected components), Tarjan 1972"""
+
+# A strongly connected component (SCC) is a maximal set of vertices where every vertex can reach every other vertex. Collapsing each SCC into
+# a single vertex gives the component graph (condensation), which is always a DAG. Two facts make this useful for shortest paths :
+#   1) A shortest path never leaves an SCC and comes back to it (that would need a cycle in the condensation), so shortest paths between 2
+#      vertices of the same SCC only use edges inside that SCC
+#   2) A vertex in component C can only reach vertices in C or in components after C in topological order of the condensation
+# So all pairs shortest paths can be run on each SCC alone (|C|^3 instead of |V|^3) and stitched together in reverse topological order, and
+# Bellman-Ford can work one component at a time, skip every component not reachable from the source and look for negative cycles per component.
+
+import math
+import numpy as np
+from Dijkstras_Algorithm import Graph
+
+"""Iterative version of Tarjan's algorithm (no recursion limit on long paths). index[v] = DFS discovery number, low[v] = smallest index reachable
+from the DFS subtree of v through at most one back edge. v is the root of an SCC when low[v] == index[v], the SCC is then popped off the stack.
+SCCs come out in REVERSE topological order of the condensation"""
+def Tarjan_SCC(G):
+    adj_map = G._outgoing
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    counter = 0
+    for root in adj_map:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root,iter(adj_map[root]))]     # explicit DFS stack of (vertex, iterator over its remaining neighbours)
+        while work:
+            u,neighbours = work[-1]
+            for v in neighbours:
+                if v not in index:              # tree edge --> descend into v, continue with u's remaining neighbours later
+                    index[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack.add(v)
+                    work.append((v,iter(adj_map[v])))
+                    break
+                elif v in on_stack:             # back edge / cross edge inside the current SCC
+                    low[u] = min(low[u],index[v])
+            else:                               # all neighbours of u done
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent],low[u])
+                if low[u] == index[u]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w is u:
+                            break
+                    components.append(component)
+    return components
+
+
+"""Returns (components in topological order, comp_of = {vertex : position of its component}, dag = list of successor component sets)"""
+def Condensation(G):
+    components = Tarjan_SCC(G)
+    components.reverse()
+    comp_of = {}
+    for ci,component in enumerate(components):
+        for v in component:
+            comp_of[v] = ci
+    dag = [set() for x in range(len(components))]
+    for u,neighbours in G._outgoing.items():
+        for v in neighbours:
+            if comp_of[u] != comp_of[v]:
+                dag[comp_of[u]].add(comp_of[v])
+    return components,comp_of,dag
+
+
+def _floyd_warshall_in_place(D):
+    for k in range(len(D)):
+        np.minimum(D,D[:,k,None] + D[None,k,:],out = D)
+
+
+class Component_Distances:
+    """Result of Condensed_All_Pairs_Shortest_Paths(). For each component only the columns of vertices it can reach are stored"""
+    def __init__(self,comp_of):
+        self._comp_of = comp_of
+        self._blocks = {}           # component --> (row of each member, column of each reachable vertex, matrix)
+
+    def distance(self,u,v):         # shortest distance from u to v, infinity if v is not reachable from u
+        rows,columns,D = self._blocks[self._comp_of[u]]
+        j = columns.get(v)
+        return math.inf if j is None else D[rows[u]][j].item()
+
+    def row(self,u):                # {v : distance} for every vertex v reachable from u
+        rows,columns,D = self._blocks[self._comp_of[u]]
+        r = D[rows[u]]
+        return {v : r[j].item() for v,j in columns.items() if r[j] != math.inf}
+
+
+"""All pairs shortest paths = Floyd-Warshall inside each SCC, then stitched in reverse topological order : for u in component C and an edge
+(a,b) leaving C, dist(u,x) <= dist(u,a) + w(a,b) + dist(b,x) where the row of b is already final because its component comes after C.
+Unreachable pairs are never stored. Raises ValueError if some SCC contains a negative weight cycle"""
+def Condensed_All_Pairs_Shortest_Paths(G,dtype = np.float64):
+    components,comp_of,dag = Condensation(G)
+    adj_map = G._outgoing
+    result = Component_Distances(comp_of)
+    for ci in range(len(components) - 1,-1,-1):
+        members = components[ci]
+        rows = {v : i for i,v in enumerate(members)}
+        columns = dict(rows)                            # members first, then every vertex reachable through the successor components
+        for cj in dag[ci]:
+            for v in result._blocks[cj][1]:
+                if v not in columns:
+                    columns[v] = len(columns)
+        D = np.full((len(members),len(columns)),math.inf,dtype = dtype)
+        inner = D[:,:len(members)]                      # view, Floyd-Warshall on it writes into D
+        np.fill_diagonal(inner,0)
+        exits = []
+        for a in members:
+            for b in adj_map[a]:
+                w_ab = adj_map[a][b]._element
+                if b in rows:
+                    inner[rows[a]][rows[b]] = min(inner[rows[a]][rows[b]],w_ab)
+                else:
+                    exits.append((a,b,w_ab))
+        _floyd_warshall_in_place(inner)
+        if (np.diagonal(inner) < 0).any():
+            raise ValueError('Graph contains a negative weight cycle')
+        for a,b,w_ab in exits:                          # stitch : dist(u,x) = min(dist(u,x), dist(u,a) + w(a,b) + dist(b,x))
+            b_rows,b_columns,b_D = result._blocks[comp_of[b]]
+            cols = [columns[x] for x in b_columns]
+            D[:,cols] = np.minimum(D[:,cols],inner[:,rows[a],None] + w_ab + b_D[b_rows[b]][None,:])
+        result._blocks[ci] = (rows,columns,D)
+    return result
+
+
+"""Bellman-Ford one component at a time in topological order. When component C is processed, every edge coming into C from earlier components
+has already been relaxed with final distances, and a shortest path stays inside C after entering it, so |C| - 1 rounds over the edges inside C
+are enough. Components not reachable from s are skipped entirely (their vertices keep _d = infinity). Returns False if a negative weight cycle
+is reachable from s, True otherwise, same as Bellman_Ford()"""
+def Component_Bellman_Ford(G,s):
+    components,comp_of,dag = Condensation(G)
+    adj_map = G._outgoing
+    for v in adj_map:
+        v._d = math.inf
+        v._parent = None
+    s._d = 0
+    reachable = {comp_of[s]}
+    for ci in range(comp_of[s],len(components)):       # components before s's component can not be reached from s
+        if ci not in reachable:
+            continue
+        members = components[ci]
+        inner_edges = [(u,v,adj_map[u][v]._element) for u in members for v in adj_map[u] if comp_of[v] == ci]
+        for i in range(1,len(members)):
+            changed = False
+            for u,v,w_uv in inner_edges:
+                if Relax(u,v,w_uv):
+                    changed = True
+            if not changed:                             # distances in this component are final already
+                break
+        for u,v,w_uv in inner_edges:                    # negative cycle check, only for this component
+            if v._d > u._d + w_uv:
+                return False
+        for u in members:                               # relax the edges leaving the component
+            for v in adj_map[u]:
+                if comp_of[v] != ci:
+                    Relax(u,v,adj_map[u][v]._element)
+        reachable.update(dag[ci])
+    return True
+
+
+def Relax(u,v,w_uv):
+    if v._d > u._d + w_uv:
+        v._d = u._d + w_uv
+        v._parent = u
+        return True
+    return False
+
+
+gr = Graph(directed=True)       # 2 SCCs {1,2,3} and {4,5}, vertex 6 is not reachable from 1
+v_1 = gr.insert_vertex(1)
+v_2 = gr.insert_vertex(2)
+v_3 = gr.insert_vertex(3)
+v_4 = gr.insert_vertex(4)
+v_5 = gr.insert_vertex(5)
+v_6 = gr.insert_vertex(6)
+
+gr.insert_edge(v_1,v_2,4)
+gr.insert_edge(v_2,v_3,-2)
+gr.insert_edge(v_3,v_1,1)
+gr.insert_edge(v_3,v_4,3)
+gr.insert_edge(v_4,v_5,-1)
+gr.insert_edge(v_5,v_4,2)
+gr.insert_edge(v_6,v_5,7)
+
+all_pairs = Condensed_All_Pairs_Shortest_Paths(gr)
+no_negative_cycle = Component_Bellman_Ford(gr,v_1)